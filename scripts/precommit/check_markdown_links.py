@@ -8,6 +8,7 @@ Features:
 - Ignores example files in projects/
 - Skips URLs (http://, https://, ftp://, mailto:)
 - Handles anchor links (#section-name)
+- Uses the regex module for faster matching if installed, falls back to re
 - Self-contained with built-in tests (run with pytest)
 
 Usage:
@@ -55,60 +56,168 @@ Exit Codes:
     1: One or more broken links found
 """
 
+import os
 import re
+import stat
 import sys
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
-from collections.abc import Sequence
 
-
-def find_relative_links(content: str) -> list[tuple[str, str]]:
-    """Find all relative links in markdown content, returns (text, link) tuples."""
-    # Match [text](link) but exclude URLs with protocols and pure anchor links
-    pattern = r"\[([^\]]+)\]\((?!https?://|ftp://|mailto:|#)([^)#\s]+)(?:#[^)]*)?\)"
-    return [(match[1], match[2]) for match in re.finditer(pattern, content)]
+# Match [text](link#anchor) but exclude URLs with protocols and pure anchor
+# links. The path and anchor classes are disjoint so the engine never
+# backtracks between them. The exclusion must stay a lookahead: consuming an
+# excluded link would hide a relative link nested inside it.
+try:
+    # Optional: the regex module supports possessive quantifiers, which stop
+    # the engine from saving backtracking state at all
+    import regex
+
+    _LINK_RE = regex.compile(
+        rb"\[([^\]]++)\]\((?!https?://|ftp://|mailto:|#)([^)#\s]++)(?:#[^)]*+)?\)"
+    )
+except ImportError:
+    _LINK_RE = re.compile(
+        rb"\[([^\]]+)\]\((?!https?://|ftp://|mailto:|#)([^)#\s]+)(?:#[^)]*)?\)"
+    )
+
+
+def find_relative_links(content: bytes) -> list[tuple[str, str]]:
+    """Find all relative links in markdown content, returns (text, link) tuples.
+
+    Content is scanned as raw bytes; only the matched groups are decoded.
+    """
+    # Substring search is much cheaper than running the regex on link-free files
+    if b"](" not in content:
+        return []
+    return [
+        (match[1].decode(), match[2].decode()) for match in _LINK_RE.finditer(content)
+    ]
 
 
 def find_repo_root(start_path: Path) -> Path:
     """Find the repository root by looking for .git directory."""
-    current = start_path.resolve()
-    while current != current.parent:
-        if (current / ".git").exists():
-            return current
-        current = current.parent
-    return start_path.resolve()
-
-
-def verify_links(file_path: Path, links: list[tuple[str, str]]) -> list[str]:
-    """Verify each link resolves to an existing file."""
+    # Walk with os.path strings to avoid building two Paths per level
+    start = os.path.realpath(start_path)
+    current = start
+    while True:
+        # lstat is the lightest probe and, unlike isdir, also accepts the .git
+        # file used by worktrees and submodules
+        try:
+            os.lstat(os.path.join(current, ".git"))
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        else:
+            return Path(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return Path(start)
+        current = parent
+
+
+@dataclass
+class LinkCache:
+    """Filesystem lookups memoized for a single run.
+
+    The same directories and links (e.g. to a shared index) recur across
+    files, but the answers go stale as soon as the tree changes, so a cache
+    must not outlive the run it was created for.
+    """
+
+    repo_roots: dict[str, str] = field(default_factory=dict)
+    dirs: dict[str, str] = field(default_factory=dict)
+    targets: dict[tuple[str, str], tuple[str, bool]] = field(default_factory=dict)
+
+    def repo_root(self, directory: str) -> str:
+        """Find the repository root once per directory instead of once per file."""
+        root = self.repo_roots.get(directory)
+        if root is None:
+            root = self.repo_roots[directory] = str(find_repo_root(Path(directory)))
+        return root
+
+    def resolve_dir(self, path: str) -> str:
+        """Resolve a directory path once, since many links share a directory."""
+        resolved = self.dirs.get(path)
+        if resolved is None:
+            resolved = self.dirs[path] = os.path.realpath(path)
+        return resolved
+
+    def check_link_target(self, base_dir: str, link_path: str) -> tuple[str, bool]:
+        """Resolve a link and check that its target exists, once per link."""
+        key = (base_dir, link_path)
+        result = self.targets.get(key)
+        if result is None:
+            result = self.targets[key] = check_link_target(base_dir, link_path, self)
+        return result
+
+
+def resolve_link_target(
+    base_dir: str, link_path: str, cache: LinkCache | None = None
+) -> str:
+    """Resolve the directory part of a link relative to base_dir.
+
+    The leaf is not followed; with its directory resolved, only the leaf
+    itself can still be a symlink, which check_link_target follows.
+    """
+    head, leaf = os.path.split(os.path.join(base_dir, link_path))
+    if leaf in ("", ".", ".."):
+        return os.path.realpath(os.path.join(head, leaf))
+    resolved = cache.resolve_dir(head) if cache else os.path.realpath(head)
+    return os.path.join(resolved, leaf)
+
+
+def check_link_target(
+    base_dir: str, link_path: str, cache: LinkCache | None = None
+) -> tuple[str, bool]:
+    """Resolve a link and check that its target exists."""
+    target = resolve_link_target(base_dir, link_path, cache)
+    # One lstat answers existence for the common non-symlink case
+    try:
+        if stat.S_ISLNK(os.lstat(target).st_mode):
+            target = os.path.realpath(target)
+            os.stat(target)
+    except (FileNotFoundError, NotADirectoryError):
+        return target, False
+    return target, True
+
+
+def verify_links(
+    file_path: Path, links: list[tuple[str, str]], cache: LinkCache | None = None
+) -> list[str]:
+    """Verify each link resolves to an existing file.
+
+    Pass the same cache for every file of one run to share lookups between
+    them; without one, each call sees the current filesystem.
+    """
+    if cache is None:
+        cache = LinkCache()
     errors = []
-    repo_root = find_repo_root(file_path)
+    file_str = str(file_path)
 
     # Skip example and template files
-    if "examples" in str(file_path) or "templates" in str(file_path):
+    if "examples" in file_str or "templates" in file_str:
         return []
 
+    # Absolute so cache keys stay valid across working directories
+    base_dir = os.path.abspath(file_path.parent)
+    repo_root_str = cache.repo_root(base_dir)
+    repo_prefix = os.path.join(repo_root_str, "")
     for _link_text, link_path in links:
         try:
             # Handle both root-relative and directory-relative paths
             if link_path.startswith("/"):
-                target = (repo_root / link_path.lstrip("/")).resolve()
-            elif link_path.startswith("./"):
-                target = (file_path.parent / link_path[2:]).resolve()
+                target, exists = cache.check_link_target(
+                    repo_root_str, link_path.lstrip("/")
+                )
             else:
-                target = (file_path.parent / link_path).resolve()
+                target, exists = cache.check_link_target(base_dir, link_path)
 
-            # Follow symlinks and check final target
-            while target.is_symlink():
-                target = target.resolve()
-
-            if not target.exists():
+            if not exists:
                 errors.append(f"{file_path}: Broken link: {link_path} -> {target}")
                 continue
 
             # Check that target is within repo_root to prevent directory traversal
-            try:
-                target.relative_to(repo_root)
-            except ValueError:
+            if target != repo_root_str and not target.startswith(repo_prefix):
                 errors.append(
                     f"{file_path}: Link {link_path} points outside repository"
                 )
@@ -119,21 +228,48 @@ def verify_links(file_path: Path, links: list[tuple[str, str]]) -> list[str]:
     return errors
 
 
+def walk_markdown_files(root: str = ".") -> Iterator[str]:
+    """Yield paths of markdown files under root, skipping symlinks.
+
+    Uses os.scandir directly so file types come from the cached directory
+    entries instead of a stat per path.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except PermissionError:
+            # Skip unreadable directories, as Path.rglob does
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md") and not entry.is_symlink():
+                    yield entry.path
+
+
+def read_file(path: str) -> bytes:
+    """Read a file's contents as bytes."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
 def main(argv: Sequence[str] = sys.argv) -> int:
     """Main function."""
     if len(argv) > 1:
-        files = [Path(f) for f in argv[1:]]
+        # Skip symlinks to avoid duplicates
+        files = [f for f in argv[1:] if not os.path.islink(f)]
     else:
-        files = list(Path().rglob("*.md"))
+        files = list(walk_markdown_files())
 
     all_errors = []
-    for file in files:
-        if file.is_symlink():  # Skip symlinks to avoid duplicates
+    cache = LinkCache()
+    for file, content in zip(files, map(read_file, files)):
+        if b"](" not in content:
             continue
-
-        content = file.read_text()
         links = find_relative_links(content)
-        errors = verify_links(file, links)
+        errors = verify_links(Path(file), links, cache)
         all_errors.extend(errors)
 
     if all_errors:
@@ -144,7 +280,7 @@ def main(argv: Sequence[str] = sys.argv) -> int:
 
 def test_find_relative_links():
     """Test the link finding function."""
-    content = """# Test Document
+    content = b"""# Test Document
 [valid link](./file.md)
 [external](https://example.com)
 [mail](mailto:test@example.com)
@@ -156,6 +292,10 @@ def test_find_relative_links():
     assert links[0] == ("valid link", "./file.md")
     assert links[1] == ("combined", "./file.md")
 
+    # Links nested inside excluded links are still found
+    assert find_relative_links(b"[x](#foo [y](z.md))") == [("y", "z.md")]
+    assert find_relative_links(b"[a](http://x.com/[b](c.md))") == [("b", "c.md")]
+
 
 def test_verify_links():
     """Test the link verification function."""
@@ -175,6 +315,7 @@ def test_verify_links():
         (root / "dir1/file1.md").write_text("file1")
         (root / "dir2/file2.md").write_text("file2")
         (root / "dir1/symlink.md").symlink_to("../target.md")
+        (root / "dir1/outside.md").symlink_to(os.devnull)
 
         # Save current directory and change to test directory
         old_cwd = os.getcwd()
@@ -184,25 +325,39 @@ def test_verify_links():
             # Test valid links
             test_file = root / "test.md"
             test_file.write_text("[link](./target.md)")
-            errors = verify_links(test_file, find_relative_links(test_file.read_text()))
+            errors = verify_links(
+                test_file, find_relative_links(test_file.read_bytes())
+            )
             assert len(errors) == 0
 
             # Test broken link
             test_file.write_text("[broken](./nonexistent.md)")
-            errors = verify_links(test_file, find_relative_links(test_file.read_text()))
+            errors = verify_links(
+                test_file, find_relative_links(test_file.read_bytes())
+            )
             assert len(errors) == 1
             assert "Broken link" in errors[0]
 
             # Test symlink
             test_file.write_text("[symlink](./dir1/symlink.md)")
-            errors = verify_links(test_file, find_relative_links(test_file.read_text()))
+            errors = verify_links(
+                test_file, find_relative_links(test_file.read_bytes())
+            )
             assert len(errors) == 0
 
+            # Test symlink pointing outside the repository
+            test_file.write_text("[outside](./dir1/outside.md)")
+            errors = verify_links(
+                test_file, find_relative_links(test_file.read_bytes())
+            )
+            assert len(errors) == 1
+            assert "points outside repository" in errors[0]
+
             # Test example file (should be ignored)
             example_file = root / "projects/example/examples/test.md"
             example_file.write_text("[broken](./nonexistent.md)")
             errors = verify_links(
-                example_file, find_relative_links(example_file.read_text())
+                example_file, find_relative_links(example_file.read_bytes())
             )
             assert len(errors) == 0
 
@@ -210,5 +365,108 @@ def test_verify_links():
             os.chdir(old_cwd)
 
 
+def test_main_from_different_directories():
+    """Test that cached resolutions don't leak between working directories."""
+    import os
+    import tempfile
+
+    old_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp1, tempfile.TemporaryDirectory() as tmp2:
+        # Same relative link in both, but the target only exists in the second
+        (Path(tmp1) / "README.md").write_text("[b](./b.md)")
+        (Path(tmp2) / "README.md").write_text("[b](./b.md)")
+        (Path(tmp2) / "b.md").write_text("b")
+
+        try:
+            os.chdir(tmp1)
+            assert main(["check_markdown_links.py", "README.md"]) == 1
+            os.chdir(tmp2)
+            assert main(["check_markdown_links.py", "README.md"]) == 0
+        finally:
+            os.chdir(old_cwd)
+
+
+def test_walk_markdown_files_skips_unreadable_dirs():
+    """Test that unreadable directories are skipped instead of aborting the walk."""
+    import os
+    import tempfile
+    from unittest import mock
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "locked").mkdir()
+        (Path(tmpdir) / "locked/hidden.md").write_text("hidden")
+        (Path(tmpdir) / "open.md").write_text("open")
+
+        # Simulated, since chmod doesn't stop root from listing a directory
+        locked = os.path.join(tmpdir, "locked")
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if path == locked:
+                raise PermissionError(13, "Permission denied", path)
+            return real_scandir(path)
+
+        with mock.patch("os.scandir", scandir):
+            files = list(walk_markdown_files(tmpdir))
+        assert files == [os.path.join(tmpdir, "open.md")]
+
+
+def test_verify_links_after_chdir():
+    """Test that direct verify_links calls with relative paths survive a chdir."""
+    import os
+    import tempfile
+
+    old_cwd = os.getcwd()
+    links = [("b", "./b.md")]
+    with tempfile.TemporaryDirectory() as tmp1, tempfile.TemporaryDirectory() as tmp2:
+        (Path(tmp2) / "b.md").write_text("b")
+
+        try:
+            os.chdir(tmp1)
+            assert len(verify_links(Path("README.md"), links)) == 1
+            os.chdir(tmp2)
+            assert verify_links(Path("README.md"), links) == []
+        finally:
+            os.chdir(old_cwd)
+
+
+def test_verify_links_sees_filesystem_changes():
+    """Test that repeated verify_links calls see files and symlinks that changed."""
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / ".git").mkdir()
+        (root / "d").mkdir()
+        readme = root / "README.md"
+
+        # A broken link is fixed by creating its target
+        links = [("x", "./x.md")]
+        assert len(verify_links(readme, links)) == 1
+        (root / "x.md").write_text("x")
+        assert verify_links(readme, links) == []
+
+        # A directory swapped for a symlink out of the repository is caught
+        name = Path(os.devnull).name
+        links = [("f", f"d/{name}")]
+        (root / "d" / name).write_text("f")
+        assert verify_links(readme, links) == []
+        (root / "d" / name).unlink()
+        (root / "d").rmdir()
+        (root / "d").symlink_to(os.path.dirname(os.path.realpath(os.devnull)))
+        errors = verify_links(readme, links)
+        assert len(errors) == 1
+        assert "outside repository" in errors[0]
+
+        # A shared cache keeps answers for the rest of its run
+        cache = LinkCache()
+        links = [("y", "./y.md")]
+        assert len(verify_links(readme, links, cache)) == 1
+        (root / "y.md").write_text("y")
+        assert len(verify_links(readme, links, cache)) == 1
+        assert verify_links(readme, links) == []
+
+
 if __name__ == "__main__":
     sys.exit(main())